@@ -5,18 +5,26 @@ import uuid
 from datetime import datetime
 import sys
 import random
+import pymysql
+import click
 from dotenv import load_dotenv
 
 # Make sure to adjust this path if your project structure is different
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.utils.file_utils import save_uploaded_file, allowed_file
 from src.utils.auth_utils import hash_password, verify_password, validate_password
-from src.utils.database import get_connection, create_database, create_tables, show_tables, clear_all_tables
+from src.utils.database import create_database, create_tables, show_tables, clear_all_tables
 from src.utils.database import insert_student, insert_alumni, insert_admin, drop_all_tables
 from src.utils.database import is_unique_email, is_unique_student_id, is_unique_admin_code
 from src.utils.database import get_all_admins, get_all_students, get_all_alumni
-from src.utils.database import login_credential_exists, verify_student_credentials
-from flask import jsonify
+from src.utils.database import get_user_by_email, get_user_by_id, get_alumni_by_graduation_year
+from src.utils.database import FEED_TABLES
+from src.utils.database import DatabaseUnavailable, start_request_budget, clear_request_budget
+from src.utils.change_feed import RegistrationBroadcaster, sse_stream, fetch_changes, encode_cursor, decode_cursor
+from src.utils.page_cache import cached_page, prerender_pages
+from src.utils.feedback_queue import FeedbackBuffer, validate_feedback
+from src.utils.profiling import TraceStore, SPAN_KINDS, start_trace, end_trace, connect_template_signals
+from flask import jsonify, Response, send_file
 
 # Load environment variables from .env file
 load_dotenv()
@@ -35,10 +43,95 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# One shared DB poller feeds every open admin dashboard
+registration_feed = RegistrationBroadcaster(
+    interval=int(os.getenv("FEED_POLL_INTERVAL", "5")),
+    serializer=app.json.dumps,
+)
+
+
+# Feedback is written to the DB in batches by a background thread
+feedback_buffer = FeedbackBuffer(
+    max_size=int(os.getenv("FEEDBACK_BUFFER_SIZE", "10000")),
+    batch_size=int(os.getenv("FEEDBACK_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("FEEDBACK_FLUSH_INTERVAL", "1")),
+)
+
+# Opt-in request profiling: sampled at PROFILE_SAMPLE_RATE (0-1), or forced
+# per request by sending the PROFILE_TOKEN value in an X-Profile header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+trace_store = TraceStore(
+    os.getenv("PROFILE_DIR", "profiles"),
+    max_traces=int(os.getenv("PROFILE_MAX_TRACES", "200")),
+)
+connect_template_signals(app)
+
+# ---------------- DB TIME BUDGET PER REQUEST ----------------
+@app.before_request
+def start_db_budget():
+    start_request_budget()
+
+@app.teardown_request
+def clear_db_budget(exc):
+    clear_request_budget()
+
+# ---------------- REQUEST PROFILING ----------------
+@app.before_request
+def start_profiling():
+    forced = PROFILE_TOKEN and request.headers.get("X-Profile") == PROFILE_TOKEN
+    if forced or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+        start_trace(request.method, request.path, request.endpoint)
+
+def store_trace(trace, status):
+    trace.finish(status)
+    try:
+        trace_store.save(trace)
+    except OSError as e:
+        print("❌ Error saving profile trace:", e)
+
+@app.after_request
+def save_profile(response):
+    trace = end_trace()
+    if trace is not None:
+        store_trace(trace, response.status_code)
+        response.headers["X-Profile-Id"] = trace.id
+    return response
+
+@app.teardown_request
+def finish_failed_profile(exc):
+    # Only still set if the request raised before after_request ran; keep those
+    # traces too, since failing requests are often the ones worth profiling
+    trace = end_trace()
+    if trace is not None and exc is not None:
+        store_trace(trace, 500)
+
+@app.errorhandler(DatabaseUnavailable)
+@app.errorhandler(pymysql.err.OperationalError)
+def database_unavailable(error):
+    print("❌ Database unavailable:", error)
+    if request.path == "/get-tables" or request.path.startswith("/changes"):
+        return jsonify({"error": "Database temporarily unavailable"}), 503, {"Retry-After": "30"}
+    flash("We're having trouble reaching the database. Please try again in a moment.", "error")
+    return redirect(url_for('home'))
+
+
+# Public pages that render the same for every visitor: URL path -> template
+CACHED_PAGES = {
+    '/': 'homepage.html',
+    '/fintech': 'fintech2.html',
+    '/fintech-stud': 'fintech2 stud.html',
+    '/fintech-alum': 'fintech2 alumni.html',
+}
+
 
 @app.route('/')
 def home():
-    return render_template('homepage.html')
+    # Pending flash messages make the page per-user, so skip the cache for them
+    if '_flashes' in session:
+        return render_template('homepage.html')
+    # max-age=0 so browsers revalidate and pick up flashes after login/logout redirects
+    return cached_page('homepage.html', max_age=0)
 
 from flask import session
 
@@ -52,6 +145,8 @@ def logout():
 
 @app.route("/init-db")
 def init_db():
+    # Index builds and partitioning can take minutes; they use DB_SCHEMA_TIMEOUT instead
+    clear_request_budget()
     create_database()
     create_tables()
     tables = show_tables()
@@ -67,15 +162,58 @@ def del_tables():
 
 @app.route("/get-tables")
 def get_tables():
-    admins = get_all_admins()
-    students = get_all_students()
-    alumni = get_all_alumni()
+    # Admins only see their own college's records
+    if not session.get('logged_in') or session.get('user_type') != 'admin' or 'admin_college' not in session:
+        return jsonify({"error": "Admin login required"}), 401
+
+    college = session.get('admin_college')
+    admins = get_all_admins(college)
+    students = get_all_students(college)
+    alumni = get_all_alumni(college)
     return jsonify({
         "Admins": admins,
         "Students": students,
         "Alumni": alumni
     })
 
+@app.route("/changes")
+def changes():
+    # Simple session check for admin
+    if not session.get('logged_in') or session.get('user_type') != 'admin' or 'admin_college' not in session:
+        return jsonify({"error": "Admin login required"}), 401
+
+    kind = request.args.get('table', 'students')
+    if kind not in FEED_TABLES:
+        return jsonify({"error": f"Unknown table {kind}"}), 400
+
+    try:
+        since_date, since_id = decode_cursor(request.args.get('since', ''))
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    limit = max(1, min(request.args.get('limit', 500, type=int), 1000))
+    # Rows may repeat ones sent before (overlap window); the dashboards upsert by id
+    rows, cursor, has_more = fetch_changes(kind, since_date, since_id, limit, college=session.get('admin_college'))
+
+    return jsonify({
+        "table": kind,
+        "rows": rows,
+        "cursor": encode_cursor(*cursor),
+        "has_more": has_more
+    })
+
+@app.route("/changes/stream")
+def changes_stream():
+    # Simple session check for admin
+    if not session.get('logged_in') or session.get('user_type') != 'admin' or 'admin_college' not in session:
+        return jsonify({"error": "Admin login required"}), 401
+
+    return Response(
+        sse_stream(registration_feed, college=session.get('admin_college')),
+        mimetype="text/event-stream",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
@@ -160,31 +298,23 @@ def login_student():
         email = request.form.get('email')
         password = request.form.get('password')
 
-        if not login_credential_exists(email, status='student'):
+        # One lookup covers existence, password check and session data
+        student = get_user_by_email('student', email, with_password=True)
+        if not student:
             flash("Email not registered. Please register first!", "error")
             return redirect(url_for('login_student'))
 
-        if not verify_student_credentials(email, password, status='student'):
+        if not verify_password(password, student['password_hash']):
             flash("Incorrect password. Try again!", "error")
             return redirect(url_for('login_student'))
 
-        # Fetch student data from DB
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Students WHERE email=%s", (email,))
-        student = cursor.fetchone()
-        conn.close()
-
-        if not student:
-            flash("Student not found!", "error")
-            return redirect(url_for('login_student'))
-
         # Store complete student info in session
         session['logged_in'] = True
         session['user_type'] = 'student'
         session['student_id'] = student['id']
         session['student_email'] = student['email']
         session['student_name'] = student['name']
+        session['student_college'] = student['college']
         
         # flash(f"Welcome, {email}!", "success")
         return redirect(url_for('student_dashboard'))
@@ -212,11 +342,7 @@ def student_card():
     
     student_id = session.get('student_id')
     
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Students WHERE id=%s", (student_id,))
-    student = cursor.fetchone()
-    conn.close()
+    student = get_user_by_id('student', student_id)
 
     if not student:
         flash("Student not found!", "error")
@@ -243,7 +369,7 @@ import random  # Add this import at the top of your file
 
 @app.route("/fintech-stud")
 def fintech_stud():
-    return render_template("fintech2 stud.html")
+    return cached_page("fintech2 stud.html")
 
 @app.route('/login-alumni', methods=['GET', 'POST'])
 def login_alumni():
@@ -251,31 +377,23 @@ def login_alumni():
         email = request.form.get('email')
         password = request.form.get('password')
 
-        if not login_credential_exists(email, status='alumni'):
+        # One lookup covers existence, password check and session data
+        alumni = get_user_by_email('alumni', email, with_password=True)
+        if not alumni:
             flash("Email not registered. Please register first!", "error")
             return redirect(url_for('login_alumni'))
 
-        if not verify_student_credentials(email, password, status='alumni'):
+        if not verify_password(password, alumni['password_hash']):
             flash("Incorrect password. Try again!", "error")
             return redirect(url_for('login_alumni'))
 
-        # Fetch alumni data from DB
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Alumni WHERE email=%s", (email,))
-        alumni = cursor.fetchone()
-        conn.close()
-
-        if not alumni:
-            flash("Alumni not found!", "error")
-            return redirect(url_for('login_alumni'))
-
         # Store complete alumni info in session
         session['logged_in'] = True
         session['user_type'] = 'alumni'
         session['alumni_id'] = alumni['id']
         session['alumni_email'] = alumni['email']
         session['alumni_name'] = alumni['name']
+        session['alumni_college'] = alumni['college']
 
         # flash(f"Welcome, {email}!", "success")
         return redirect(url_for('alumni_dashboard'))
@@ -290,11 +408,12 @@ def alumni_dashboard():
         flash("Please log in first!", "error")
         return redirect(url_for('login_alumni'))
     
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Alumni ORDER BY graduation_year DESC")
-    alumni_data = cursor.fetchall()
-    conn.close()
+    # Degrade to an empty listing rather than failing the whole dashboard
+    try:
+        alumni_data = get_alumni_by_graduation_year(session.get('alumni_college'))
+    except (DatabaseUnavailable, pymysql.err.OperationalError) as e:
+        print("❌ Database unavailable, showing alumni dashboard without listing:", e)
+        alumni_data = []
     alumni_id = session.get('alumni_id')
     return render_template('alumnipage.html', alumni_id=alumni_id, alumni_data=alumni_data)
 
@@ -308,12 +427,7 @@ def alumni_card():
     
     alumni_id = session.get('alumni_id')
     
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    # FIXED: Query Alumni table instead of Students table
-    cursor.execute("SELECT * FROM Alumni WHERE id=%s", (alumni_id,))
-    alumni = cursor.fetchone()
-    conn.close()
+    alumni = get_user_by_id('alumni', alumni_id)
 
     if not alumni:
         flash("Alumni not found!", "error")
@@ -386,31 +500,23 @@ def login_college():
         email = request.form.get('email')
         password = request.form.get('password')
 
-        if not login_credential_exists(email, status='college'):
+        # One lookup covers existence, password check and session data
+        admin = get_user_by_email('college', email, with_password=True)
+        if not admin:
             flash("Email not registered. Please register first!", "error")
             return redirect(url_for('login_college'))
 
-        if not verify_student_credentials(email, password, status='college'):
+        if not verify_password(password, admin['password_hash']):
             flash("Incorrect password. Try again!", "error")
             return redirect(url_for('login_college'))
 
-        # Fetch admin data from DB (corrected table name)
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Admins WHERE email=%s", (email,))
-        admin = cursor.fetchone()
-        conn.close()
-
-        if not admin:
-            flash("Admin not found!", "error")
-            return redirect(url_for('login_college'))
-
         # Store complete admin info in session
         session['logged_in'] = True
         session['user_type'] = 'admin'
         session['admin_id'] = admin['id']
         session['admin_email'] = admin['email']
         session['admin_name'] = admin['name']
+        session['admin_college'] = admin['college']
         
         # flash(f"Welcome, {email}!", "success")
         return redirect(url_for('admin_dashboard'))
@@ -430,11 +536,11 @@ def admin_dashboard():
 
 @app.route("/fintech")
 def fintech():
-    return render_template("fintech2.html")
+    return cached_page("fintech2.html")
 
 @app.route("/fintech-alum")
 def fintech_alum():
-    return render_template("fintech2 alumni.html")
+    return cached_page("fintech2 alumni.html")
 
 @app.route('/alumni-database')
 def alumni_database():
@@ -454,14 +560,83 @@ def student_database():
     
     return render_template('student_database.html')
 
+@app.route('/feedback', methods=['GET', 'POST'])
+def feedback():
+    if request.method == 'GET':
+        return render_template('feedbackportion.html')
+
+    # Simple session check
+    user_type = session.get('user_type')
+    if not session.get('logged_in') or user_type not in ('student', 'alumni', 'admin'):
+        return jsonify({"errors": ["Please log in first to add your feedback"]}), 401
+
+    data = request.get_json(silent=True) or request.form
+    if not isinstance(data, dict):
+        return jsonify({"errors": ["Feedback must be sent as a form or JSON object"]}), 400
+    rating = data.get('rating')
+    message = data.get('message')
+
+    errors = validate_feedback(rating, message)
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    row = (
+        session.get(f'{user_type}_id'),
+        user_type,
+        session.get(f'{user_type}_college'),
+        int(rating),
+        message.strip(),
+        datetime.now(),
+    )
+    if not feedback_buffer.submit(row):
+        return jsonify({"errors": ["We're receiving a lot of feedback right now. Please try again shortly."]}), 503, {"Retry-After": "5"}
+
+    return jsonify({"message": "Thanks for your feedback!"}), 202
+
+@app.route('/admin/profiles')
+def admin_profiles():
+    # Simple session check for admin
+    if not session.get('logged_in') or session.get('user_type') != 'admin':
+        flash("Please log in as admin first!", "error")
+        return redirect(url_for('login_college'))
+
+    return render_template('profiles.html', traces=trace_store.slowest(), span_kinds=SPAN_KINDS + ("other",))
+
+@app.route('/admin/profiles/<trace_id>.prof')
+def admin_profile_download(trace_id):
+    # Simple session check for admin
+    if not session.get('logged_in') or session.get('user_type') != 'admin':
+        flash("Please log in as admin first!", "error")
+        return redirect(url_for('login_college'))
+
+    path = trace_store.profile_path(trace_id)
+    if path is None:
+        return "Profile not found", 404
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=f"{trace_id}.prof")
+
 # ---------------- DISABLE BACK AFTER LOGOUT ----------------
 @app.after_request
 def add_header(response):
+    # Pages served from the page cache already carry public caching headers
+    if "Cache-Control" in response.headers:
+        return response
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0"
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "-1"
     return response
 
+# ---------------- PRE-RENDER PUBLIC PAGES ----------------
+@app.cli.command("prerender-pages")
+@click.option("--out", default="build/pages", help="Directory the front proxy serves static pages from")
+def prerender_pages_command(out):
+    """Write CACHED_PAGES to static files, e.g. build/pages/fintech/index.html.
+
+    The static homepage cannot show flash messages, so the proxy should only
+    serve it to requests without a session cookie.
+    """
+    for path in prerender_pages(app, CACHED_PAGES, out):
+        print(f"✅ {path}")
+
 if __name__ == '__main__':
     create_database()
     create_tables()
@@ -0,0 +1,79 @@
+"""
+Burst load on the feedback endpoint.
+
+Fires --requests POST /feedback submissions from --threads concurrent
+logged-in clients and reports how many were accepted per second, how many
+were pushed back with 503, and how long the background flusher took to
+write the accepted rows. Needs the database from .env unless --dry-run is
+given, which discards batches to measure the ingestion path on its own.
+
+    python benchmarks/bench_feedback_burst.py --requests 20000 --threads 16
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+import app as alumni_app
+
+
+def client_worker(count, results):
+    client = alumni_app.app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['user_type'] = 'student'
+        session['student_id'] = 'bench-student'
+        session['student_college'] = 'Bench College'
+
+    accepted = rejected = 0
+    for i in range(count):
+        response = client.post('/feedback', data={'rating': 1 + i % 5, 'message': f"Burst feedback {i}"})
+        if response.status_code == 202:
+            accepted += 1
+        elif response.status_code == 503:
+            rejected += 1
+    results.append((accepted, rejected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true", help="discard batches instead of inserting them")
+    args = parser.parse_args()
+
+    alumni_app.app.secret_key = alumni_app.app.secret_key or "bench"
+    buffer = alumni_app.feedback_buffer
+    if args.dry_run:
+        buffer.writer = len
+    else:
+        alumni_app.create_database()
+        alumni_app.create_tables()
+
+    results = []
+    per_thread = args.requests // args.threads
+    threads = [threading.Thread(target=client_worker, args=(per_thread, results)) for _ in range(args.threads)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    burst = time.perf_counter() - start
+
+    accepted = sum(a for a, _ in results)
+    rejected = sum(r for _, r in results)
+    while buffer.written < accepted and time.perf_counter() - start < burst + 120:
+        time.sleep(0.05)
+    drained = time.perf_counter() - start
+
+    print(f"submitted        {per_thread * args.threads}")
+    print(f"accepted         {accepted}  ({accepted / burst:.0f}/s over {burst:.2f}s)")
+    print(f"rejected (503)   {rejected}")
+    print(f"written to DB    {buffer.written}  after {drained:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
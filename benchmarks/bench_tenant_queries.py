@@ -0,0 +1,103 @@
+"""
+Per-tenant query cost as the shared tables grow.
+
+Copies the AlumniNexus Students schema (indexes and partitioning included)
+into a scratch AlumniNexusBench database, grows it in steps while keeping
+the benchmarked college at a fixed size, and times the college-scoped
+listing and change-feed queries at each step. With the college-leading
+indexes in place the per-tenant timings and rows examined stay flat.
+
+    python benchmarks/bench_tenant_queries.py --steps 10000 50000 200000
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.database import get_connection, create_database, create_tables, STATEMENTS
+
+BENCH_DB = "AlumniNexusBench"
+TENANT = "Bench Tenant College"
+
+LISTING_SQL = STATEMENTS[('student', 'list_college')]
+FEED_SQL = STATEMENTS[('student', 'feed_college')]
+
+
+def setup(tenant_rows):
+    create_database()
+    create_tables()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_DB}")
+    cursor.execute(f"CREATE DATABASE {BENCH_DB}")
+    cursor.execute(f"CREATE TABLE {BENCH_DB}.Students LIKE AlumniNexus.Students")
+    conn.commit()
+    conn.close()
+
+    insert_rows(tenant_rows, lambda i: TENANT)
+
+
+def insert_rows(count, college_for, batch=5000):
+    conn = get_connection(BENCH_DB)
+    cursor = conn.cursor()
+    for start in range(0, count, batch):
+        rows = []
+        for i in range(start, min(start + batch, count)):
+            row_id = str(uuid.uuid4())
+            rows.append((row_id, f"Student {i}", college_for(i), f"{row_id}@bench.test",
+                         "Computer Science", 2020 + i % 8, "BTech", "x"))
+        cursor.executemany("""
+            INSERT INTO Students (id, name, college, email, department, graduation_year, degree, password_hash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        conn.commit()
+    conn.close()
+
+
+def measure(sql, params, repeats):
+    conn = get_connection(BENCH_DB)
+    cursor = conn.cursor()
+    cursor.execute("ANALYZE TABLE Students")
+    cursor.fetchall()
+    cursor.execute("EXPLAIN " + sql, params)
+    examined = sum(row['rows'] or 0 for row in cursor.fetchall())
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cursor.execute(sql, params)
+        cursor.fetchall()
+    elapsed = (time.perf_counter() - start) / repeats
+    conn.close()
+    return elapsed * 1000, examined
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant-rows", type=int, default=500)
+    parser.add_argument("--colleges", type=int, default=200, help="other tenants sharing the table")
+    parser.add_argument("--steps", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    setup(args.tenant_rows)
+    total = args.tenant_rows
+    print(f"{'total rows':>12} {'listing ms':>11} {'examined':>9} {'feed ms':>9} {'examined':>9}")
+    for step in sorted(args.steps):
+        if step > total:
+            insert_rows(step - total, lambda i: f"College {i % args.colleges}")
+            total = step
+        listing_ms, listing_rows = measure(LISTING_SQL, (TENANT,), args.repeats)
+        feed_ms, feed_rows = measure(FEED_SQL, (TENANT, 500), args.repeats)
+        print(f"{total:>12} {listing_ms:>11.2f} {listing_rows:>9} {feed_ms:>9.2f} {feed_rows:>9}")
+
+    conn = get_connection()
+    conn.cursor().execute(f"DROP DATABASE IF EXISTS {BENCH_DB}")
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
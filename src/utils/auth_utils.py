@@ -1,12 +1,16 @@
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from src.utils.profiling import span
+
 def hash_password(password: str) -> str:
     """Hash a plain-text password using Werkzeug."""
-    return generate_password_hash(password)
+    with span("hashing"):
+        return generate_password_hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify a plain-text password against its hash."""
-    return check_password_hash(hashed, password)
+    with span("hashing"):
+        return check_password_hash(hashed, password)
 
 def validate_password(password: str):
     """Validate password according to requirements"""
@@ -0,0 +1,171 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.utils.database import FEED_TABLES, college_key, get_changes_since, get_changes_in_window, get_latest_cursor
+
+
+CURSOR_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# registration_date has one-second resolution and ids aren't monotonic, so a
+# row can land at or just before the cursor; every fetch re-reads this window
+FEED_OVERLAP = timedelta(seconds=int(os.getenv("FEED_OVERLAP_SECONDS", "5")))
+
+
+def encode_cursor(registration_date, row_id):
+    """Turn a (registration_date, id) pair into the opaque cursor string handed to clients."""
+    if registration_date is None:
+        return ""
+    return f"{registration_date.strftime(CURSOR_DATE_FORMAT)}|{row_id}"
+
+def decode_cursor(cursor):
+    """Parse a cursor string back into (registration_date, id). Raises ValueError if malformed."""
+    if not cursor:
+        return None, ""
+    date_part, _, row_id = cursor.partition("|")
+    return datetime.strptime(date_part, CURSOR_DATE_FORMAT), row_id
+
+def fetch_changes(kind, since_date=None, since_id="", limit=500, college=None):
+    """
+    Return (rows, cursor, has_more) for rows after the cursor, plus rows in the
+    FEED_OVERLAP window up to and including it. Each row appears once per
+    response, but the window can repeat rows from earlier responses, so callers
+    must dedupe or upsert by id. The cursor and has_more only follow the rows
+    after the cursor, so paging always advances.
+    """
+    rows = get_changes_since(kind, since_date, since_id, limit, college=college)
+    has_more = len(rows) == limit
+    cursor = (rows[-1]['registration_date'], rows[-1]['id']) if rows else (since_date, since_id)
+
+    if since_date is not None:
+        late = get_changes_in_window(kind, since_date - FEED_OVERLAP, since_date, since_id, limit, college=college)
+        rows = late + rows
+    return rows, cursor, has_more
+
+
+class RegistrationBroadcaster:
+    """
+    Polls the Students and Alumni tables on one background thread and fans
+    each batch of new registrations out to every subscribed dashboard, so
+    N open dashboards cost one query per table per interval. Subscribers
+    scoped to a college only receive that college's rows, matched with
+    college_key so the stream agrees with the SQL-scoped /changes catch-up.
+    """
+
+    def __init__(self, interval=5, queue_size=100, serializer=json.dumps):
+        self.interval = interval
+        self.queue_size = queue_size
+        self.serializer = serializer
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cursors = {}
+        self._seen = {}
+
+    def subscribe(self, college=None):
+        """Register a new listener and return its queue of encoded SSE messages."""
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[q] = college_key(college)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    def is_subscribed(self, q):
+        with self._lock:
+            return q in self._subscribers
+
+    def _publish(self, kind, rows, cursor):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        # Encode each distinct payload once, however many dashboards share it
+        messages = {}
+        for q, college in subscribers:
+            if college not in messages:
+                scoped = rows if college is None else [row for row in rows if college_key(row['college']) == college]
+                if not scoped:
+                    messages[college] = None
+                else:
+                    payload = self.serializer({"table": kind, "rows": scoped, "cursor": cursor})
+                    messages[college] = f"event: registrations\ndata: {payload}\n\n"
+            if messages[college] is None:
+                continue
+            try:
+                q.put_nowait(messages[college])
+            except queue.Full:
+                # Slow consumer: drop it, its browser will reconnect and catch up via the cursor
+                self.unsubscribe(q)
+
+    def _remember(self, kind, rows, cursor_date):
+        """Mark rows as published and forget ids that fell out of the overlap window."""
+        seen = self._seen.setdefault(kind, {})
+        for row in rows:
+            seen[row['id']] = row['registration_date']
+        if cursor_date is not None:
+            horizon = cursor_date - FEED_OVERLAP
+            for row_id in [row_id for row_id, date in seen.items() if date < horizon]:
+                del seen[row_id]
+
+    def _prime(self):
+        # Only push registrations that happen after the poller starts
+        for kind in FEED_TABLES:
+            cursor_date, cursor_id = get_latest_cursor(kind)
+            self._cursors[kind] = (cursor_date, cursor_id)
+            self._seen[kind] = {}
+            if cursor_date is not None:
+                window = get_changes_in_window(kind, cursor_date - FEED_OVERLAP, cursor_date, cursor_id)
+                self._remember(kind, window, cursor_date)
+
+    def _poll_once(self):
+        for kind in FEED_TABLES:
+            since_date, since_id = self._cursors.get(kind, (None, ""))
+            rows, cursor, _ = fetch_changes(kind, since_date, since_id)
+            seen = self._seen.setdefault(kind, {})
+            fresh = [row for row in rows if row['id'] not in seen]
+            self._cursors[kind] = cursor
+            self._remember(kind, fresh, cursor[0])
+            if fresh:
+                self._publish(kind, fresh, encode_cursor(*cursor))
+
+    def _run(self):
+        primed = False
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                if not primed:
+                    self._prime()
+                    primed = True
+                else:
+                    self._poll_once()
+            except Exception as e:
+                print("❌ Error polling change feed:", e)
+            time.sleep(self.interval)
+
+
+def sse_stream(broadcaster, college=None, keepalive=15):
+    """Generator yielding SSE messages for one client until it disconnects."""
+    q = broadcaster.subscribe(college)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                yield q.get(timeout=keepalive)
+            except queue.Empty:
+                if not broadcaster.is_subscribed(q):
+                    # Dropped as a slow consumer; let the browser reconnect
+                    return
+                yield ": keep-alive\n\n"
+    finally:
+        broadcaster.unsubscribe(q)
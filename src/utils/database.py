@@ -1,31 +1,318 @@
 import uuid
 import pymysql
 from dotenv import load_dotenv
+import functools
 import os
+import queue
+import random
 import sys
+import threading
+import time
+import unicodedata
 
-from src.utils.auth_utils import verify_password
+from src.utils.profiling import span
 
 load_dotenv()
 
+# Per-operation cap on connect/read/write, and per-request total budget (seconds)
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))
+DB_REQUEST_BUDGET = float(os.getenv("DB_REQUEST_BUDGET", "5"))
+DB_READ_RETRIES = int(os.getenv("DB_READ_RETRIES", "2"))
+# Read/write timeout for schema changes (CREATE INDEX, ALTER TABLE), which can
+# run for minutes on populated tables and are not bounded by the request budget
+DB_SCHEMA_TIMEOUT = float(os.getenv("DB_SCHEMA_TIMEOUT", "600"))
+
+
+class DatabaseUnavailable(Exception):
+    """The database is unreachable, the circuit is open, or the request's time budget is spent."""
+
+
+# ---------- Circuit breaker ----------
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures so callers fail fast
+    instead of each waiting out a timeout. After `reset_timeout` seconds one
+    trial call is let through; its success closes the circuit again. Success
+    means a statement completed, not just that a connection was opened. A
+    failure is one failed statement, or one idempotent_read call that gave
+    up, however many attempts it made.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            # A trial that never reported back (e.g. a caller that only connected) expires too
+            if self._trial_started_at is not None and now - self._trial_started_at < self.reset_timeout:
+                return False
+            self._trial_started_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_started_at = None
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+db_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("DB_BREAKER_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET", "30")),
+)
+
+
+# ---------- Per-request deadline ----------
+_request_state = threading.local()
+
+def start_request_budget(seconds=DB_REQUEST_BUDGET):
+    _request_state.deadline = time.monotonic() + seconds
+
+def clear_request_budget():
+    _request_state.deadline = None
+
+def remaining_budget():
+    """Seconds left in the current request's DB budget, or None outside a request."""
+    deadline = getattr(_request_state, "deadline", None)
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def _operation_timeout():
+    remaining = remaining_budget()
+    if remaining is None:
+        return DB_TIMEOUT
+    if remaining <= 0:
+        raise DatabaseUnavailable("Request deadline exceeded")
+    return min(DB_TIMEOUT, remaining)
+
+
 # Connection to Aiven MySQL
-def get_connection(db_name=None):
-    return pymysql.connect(
-        charset="utf8mb4",
-        connect_timeout=10,
-        cursorclass=pymysql.cursors.DictCursor,
-        db=db_name if db_name else os.getenv("DB_NAME"),  # connect to given db or default
-        host=os.getenv("DB_HOST"),
-        password=os.getenv("DB_PASSWORD"),
-        read_timeout=10,
-        port=int(os.getenv("DB_PORT")),
-        user=os.getenv("DB_USER"),
-        write_timeout=10,
-    )
+def get_connection(db_name=None, autocommit=False, timeout=None):
+    """
+    Open a dedicated, unpooled connection. An explicit `timeout` replaces the
+    per-request budget for slow admin work such as schema changes.
+    """
+    # Callers of a raw connection never report success, so don't let them
+    # take the half-open trial slot; only _execute runs the trial
+    if db_breaker.is_open:
+        raise DatabaseUnavailable("Database circuit is open")
+    return _connect(db_name, autocommit, timeout)
+
+def _schema_connection(db_name=None):
+    return get_connection(db_name, timeout=DB_SCHEMA_TIMEOUT)
+
+def _connect(db_name=None, autocommit=False, timeout=None):
+    if timeout is None:
+        timeout = _operation_timeout()
+    try:
+        with span("db"):
+            conn = pymysql.connect(
+                autocommit=autocommit,
+                charset="utf8mb4",
+                connect_timeout=min(timeout, DB_TIMEOUT),
+                cursorclass=pymysql.cursors.DictCursor,
+                db=db_name if db_name else os.getenv("DB_NAME"),  # connect to given db or default
+                host=os.getenv("DB_HOST"),
+                password=os.getenv("DB_PASSWORD"),
+                read_timeout=timeout,
+                port=int(os.getenv("DB_PORT")),
+                user=os.getenv("DB_USER"),
+                write_timeout=timeout,
+            )
+    except pymysql.err.OperationalError as e:
+        _record_failure()
+        raise DatabaseUnavailable(f"Could not connect to database: {e}") from e
+
+    return conn
+
+# While an idempotent_read call is running, its attempts' failures are
+# collected here and counted once if the call finally gives up
+_retry_state = threading.local()
+
+def _record_failure():
+    if getattr(_retry_state, "depth", 0):
+        _retry_state.failed = True
+    else:
+        db_breaker.record_failure()
+
+def idempotent_read(func):
+    """
+    Retry a read-only query on connection errors with jittered exponential
+    backoff, as long as the circuit is closed and the request budget allows.
+    Only wrap functions that are safe to run twice.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        depth = getattr(_retry_state, "depth", 0)
+        if depth == 0:
+            _retry_state.failed = False
+        _retry_state.depth = depth + 1
+        attempt = 0
+        try:
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except (DatabaseUnavailable, pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+                    delay = random.uniform(0, min(1.0, 0.1 * 2 ** attempt))
+                    remaining = remaining_budget()
+                    if (attempt >= DB_READ_RETRIES or db_breaker.is_open
+                            or (remaining is not None and remaining <= delay)):
+                        if depth == 0 and _retry_state.failed:
+                            db_breaker.record_failure()
+                        if isinstance(e, DatabaseUnavailable):
+                            raise
+                        raise DatabaseUnavailable(str(e)) from e
+                    attempt += 1
+                    time.sleep(delay)
+        finally:
+            _retry_state.depth = depth
+    return wrapper
+
+# ---------- Connection pool ----------
+class ConnectionPool:
+    """
+    Keeps idle autocommit connections to one database for reuse, so queries
+    don't each pay for a fresh connect and TLS handshake to the hosted MySQL.
+    """
+
+    def __init__(self, db_name, max_idle=10, ping_after=30):
+        self.db_name = db_name
+        self.ping_after = ping_after
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def acquire(self):
+        # The circuit breaker is checked by _execute, once per statement
+        timeout = _operation_timeout()
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return _connect(self.db_name, autocommit=True)
+
+            # PyMySQL applies these before every socket read/write, so a
+            # reused connection honours the current request's deadline, the
+            # ping below included, rather than the previous borrower's
+            conn._read_timeout = timeout
+            conn._write_timeout = timeout
+
+            # The server drops connections idle past wait_timeout; check long-idle ones first
+            if time.monotonic() - released_at > self.ping_after:
+                try:
+                    conn.ping(reconnect=False)
+                except pymysql.err.MySQLError:
+                    self.discard(conn)
+                    continue
+            return conn
+
+    def release(self, conn):
+        if not conn.open:
+            return
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self.discard(conn)
+
+    def discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+db_pool = ConnectionPool("AlumniNexus", max_idle=int(os.getenv("DB_POOL_SIZE", "10")))
+
+def _execute(sql, params=(), fetch=None, many=False):
+    """
+    The single path every repository query goes through: check the circuit
+    breaker, check out a pooled connection, run one statement and hand the
+    connection back. Each statement counts once towards the breaker. Only
+    schema DDL, which needs DB_SCHEMA_TIMEOUT, uses its own connection.
+    fetch: 'one', 'all', or None for the affected row count.
+    """
+    if not db_breaker.allow():
+        raise DatabaseUnavailable("Database circuit is open")
+
+    conn = db_pool.acquire()
+    try:
+        with span("db"), conn.cursor() as cursor:
+            if many:
+                cursor.executemany(sql, params)
+            else:
+                cursor.execute(sql, params)
+            if fetch == "one":
+                result = cursor.fetchone()
+            elif fetch == "all":
+                result = cursor.fetchall()
+            else:
+                result = cursor.rowcount
+    except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+        # The connection may be broken; don't hand it to the next caller
+        _record_failure()
+        db_pool.discard(conn)
+        raise
+    except Exception:
+        db_pool.release(conn)
+        raise
+    db_pool.release(conn)
+    db_breaker.record_success()
+    return result
+
+def _execute_transaction(statements):
+    """
+    Run several (sql, params) statements on one pooled connection as a single
+    transaction, with the same breaker accounting as _execute. Returns the
+    affected row count of each statement.
+    """
+    if not db_breaker.allow():
+        raise DatabaseUnavailable("Database circuit is open")
+
+    conn = db_pool.acquire()
+    try:
+        with span("db"), conn.cursor() as cursor:
+            conn.begin()
+            counts = [cursor.execute(sql, params) for sql, params in statements]
+            conn.commit()
+    except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+        # The server rolls back an unfinished transaction when the connection drops
+        _record_failure()
+        db_pool.discard(conn)
+        raise
+    except Exception:
+        try:
+            conn.rollback()
+        except pymysql.err.MySQLError:
+            db_pool.discard(conn)
+        else:
+            db_pool.release(conn)
+        raise
+    db_pool.release(conn)
+    db_breaker.record_success()
+    return counts
 
 # Create the main database (AlumniNexus)
 def create_database():
-    conn = get_connection()
+    conn = _schema_connection()
     cursor = conn.cursor()
     cursor.execute("CREATE DATABASE IF NOT EXISTS AlumniNexus")
     conn.commit()
@@ -33,7 +320,7 @@ def create_database():
 
 # Create all tables inside AlumniNexus
 def create_tables():
-    conn = get_connection("AlumniNexus")
+    conn = _schema_connection("AlumniNexus")
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -46,7 +333,9 @@ def create_tables():
         graduation_year INT,
         degree VARCHAR(100),
         password_hash VARCHAR(200),
-        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_students_feed (registration_date, id),
+        INDEX idx_students_college_feed (college, registration_date, id)
     )
     """)
 
@@ -61,7 +350,10 @@ def create_tables():
         degree VARCHAR(100),
         profile_image VARCHAR(200),
         password_hash VARCHAR(200),
-        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_alumni_feed (registration_date, id),
+        INDEX idx_alumni_college_feed (college, registration_date, id),
+        INDEX idx_alumni_college_grad (college, graduation_year)
     )
     """)
 
@@ -73,86 +365,190 @@ def create_tables():
         email VARCHAR(150) UNIQUE,
         department_section VARCHAR(100),
         password_hash VARCHAR(200),
-        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_admins_college (college)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Feedback (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        user_id VARCHAR(36),
+        user_type VARCHAR(20),
+        college VARCHAR(150),
+        rating TINYINT,
+        message TEXT,
+        submitted_at DATETIME,
+        INDEX idx_feedback_college (college, submitted_at)
+    )
+    """)
+
+    # Never partitioned: its primary key is what keeps ids and emails unique
+    # across colleges once the account tables are partitioned
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS AccountKeys (
+        table_name VARCHAR(20),
+        key_type VARCHAR(10),
+        key_value VARCHAR(150),
+        PRIMARY KEY (table_name, key_type, key_value)
     )
     """)
 
     conn.commit()
     conn.close()
 
+    ensure_indexes()
+
+    partitions = os.getenv("DB_COLLEGE_PARTITIONS")
+    if partitions:
+        partition_tables_by_college(int(partitions))
+
+
+# ---------- Tenant (per-college) schema tooling ----------
+# Tables created before these indexes existed only pick them up here,
+# since CREATE TABLE IF NOT EXISTS leaves existing tables untouched.
+TENANT_INDEXES = {
+    'Students': {
+        'idx_students_feed': "registration_date, id",
+        'idx_students_college_feed': "college, registration_date, id",
+    },
+    'Alumni': {
+        'idx_alumni_feed': "registration_date, id",
+        'idx_alumni_college_feed': "college, registration_date, id",
+        'idx_alumni_college_grad': "college, graduation_year",
+    },
+    'Admins': {
+        'idx_admins_college': "college",
+    },
+}
+
+def college_key(college):
+    """
+    Fold a college name the way MySQL's default case- and accent-insensitive
+    collation compares it, so tenant checks done in Python agree with the
+    `college=%s` filters done in SQL.
+    """
+    if college is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", college)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
 
-def show_tables():
-    conn = get_connection("AlumniNexus")
+def ensure_indexes():
+    conn = _schema_connection("AlumniNexus")
     cursor = conn.cursor()
-    cursor.execute("SHOW TABLES")
-    tables = cursor.fetchall()
-    conn.close()
-    return tables
+    try:
+        cursor.execute("""
+            SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = 'AlumniNexus'
+        """)
+        existing = {(row['table_name'], row['index_name']) for row in cursor.fetchall()}
+
+        for table, indexes in TENANT_INDEXES.items():
+            for index_name, columns in indexes.items():
+                if (table, index_name) not in existing:
+                    cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+        conn.commit()
+    finally:
+        conn.close()
 
-# ---------- Student ----------
-def insert_student(name, college, email, sid,  department, graduation_year, degree, password_hash):
-    student_id = sid
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
+def _partitioned_tables(cursor):
     cursor.execute("""
-        INSERT INTO Students (id, name, college, email, department, graduation_year, degree, password_hash)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """, (student_id, name, college, email, department, graduation_year, degree, password_hash))
-    conn.commit()
-    conn.close()
-    return student_id
+        SELECT DISTINCT TABLE_NAME AS table_name FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = 'AlumniNexus' AND PARTITION_NAME IS NOT NULL
+    """)
+    return {row['table_name'] for row in cursor.fetchall()}
 
-# ---------- Alumni ----------
-def insert_alumni(name, college, email, department, graduation_year, degree, profile_image, password_hash):
-    alumni_id = str(uuid.uuid4())
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Alumni (id, name, college, email, department, graduation_year, degree, profile_image, password_hash)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, (alumni_id, name, college, email, department, graduation_year, degree, profile_image, password_hash))
-    conn.commit()
-    conn.close()
-    return alumni_id
+@idempotent_read
+def is_partitioned(table):
+    row = _execute("""
+        SELECT COUNT(*) AS count FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = 'AlumniNexus' AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+    """, (table,), fetch="one")
+    return row['count'] > 0
 
-# ---------- Admin ----------
-def insert_admin(name, college, email, admin_code, department_section, password_hash):
-    admin_id = admin_code
-    conn = get_connection("AlumniNexus")
+def partition_tables_by_college(partitions=16):
+    """
+    Hash-partition Students, Alumni and Admins by college so per-college
+    queries only touch one partition. MySQL requires the partition key in
+    every unique key, so the primary key becomes (id, college) and the
+    email key becomes (email, college). Global id/email uniqueness then
+    rests on AccountKeys, which insert_user writes in the same transaction
+    as the account; existing accounts are copied into it first.
+    """
+    conn = _schema_connection("AlumniNexus")
     cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Admins (id, name, college, email, department_section, password_hash)
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """, (admin_id, name, college, email, department_section, password_hash))
-    conn.commit()
-    conn.close()
-    return admin_id
 
+    try:
+        partitioned = _partitioned_tables(cursor)
+        for table in TENANT_INDEXES:
+            cursor.execute(f"""
+                INSERT IGNORE INTO AccountKeys (table_name, key_type, key_value)
+                SELECT '{table}', 'id', id FROM {table}
+                UNION ALL
+                SELECT '{table}', 'email', email FROM {table} WHERE email IS NOT NULL
+            """)
+            conn.commit()
+            if table in partitioned:
+                continue
+            # One statement, so a failure can't leave the new keys without the partitions
+            cursor.execute(f"""
+                ALTER TABLE {table}
+                    MODIFY college VARCHAR(150) NOT NULL,
+                    DROP PRIMARY KEY,
+                    ADD PRIMARY KEY (id, college),
+                    DROP INDEX email,
+                    ADD UNIQUE KEY email (email, college)
+                PARTITION BY KEY (college) PARTITIONS {int(partitions)}
+            """)
+        conn.commit()
+        print("✅ Tables partitioned by college!")
+    finally:
+        conn.close()
 
-def clear_all_tables():
-    conn = get_connection("AlumniNexus")
+def remove_college_partitioning():
+    conn = _schema_connection("AlumniNexus")
     cursor = conn.cursor()
 
     try:
-        cursor.execute("DELETE FROM Students")
-        cursor.execute("DELETE FROM Alumni")
-        cursor.execute("DELETE FROM Admins")
+        partitioned = _partitioned_tables(cursor)
+        for table in TENANT_INDEXES:
+            if table in partitioned:
+                cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
         conn.commit()
+        print("✅ College partitioning removed!")
+    finally:
+        conn.close()
+
+
+@idempotent_read
+def show_tables():
+    return _execute("SHOW TABLES", fetch="all")
+
+def clear_all_tables():
+    try:
+        _execute_transaction([
+            ("DELETE FROM Students", ()),
+            ("DELETE FROM Alumni", ()),
+            ("DELETE FROM Admins", ()),
+            ("DELETE FROM Feedback", ()),
+            ("DELETE FROM AccountKeys", ()),
+        ])
         print("✅ All tables cleared successfully!")
     except Exception as e:
         print("❌ Error clearing tables:", e)
-    finally:
-        conn.close()
 
 
 def drop_all_tables():
-    conn = get_connection("AlumniNexus")
+    conn = _schema_connection("AlumniNexus")
     cursor = conn.cursor()
 
     try:
         cursor.execute("DROP TABLE IF EXISTS Students")
         cursor.execute("DROP TABLE IF EXISTS Alumni")
         cursor.execute("DROP TABLE IF EXISTS Admins")
+        cursor.execute("DROP TABLE IF EXISTS Feedback")
+        cursor.execute("DROP TABLE IF EXISTS AccountKeys")
         conn.commit()
         print("✅ All tables dropped successfully!")
     except Exception as e:
@@ -161,129 +557,246 @@ def drop_all_tables():
         conn.close()
 
 
+# ---------- Role metadata ----------
+# One entry per account type. `columns` is what listings and profile lookups
+# return; password_hash is only ever read by the 'login' statement.
+ROLES = {
+    'student': {
+        'table': 'Students',
+        'columns': ["id", "name", "college", "email", "department", "graduation_year", "degree", "registration_date"],
+        'insert': ["id", "name", "college", "email", "department", "graduation_year", "degree", "password_hash"],
+    },
+    'alumni': {
+        'table': 'Alumni',
+        'columns': ["id", "name", "college", "email", "department", "graduation_year", "degree", "profile_image",
+                    "registration_date"],
+        'insert': ["id", "name", "college", "email", "department", "graduation_year", "degree", "profile_image",
+                   "password_hash"],
+    },
+    'college': {
+        'table': 'Admins',
+        'columns': ["id", "name", "college", "email", "department_section", "registration_date"],
+        'insert': ["id", "name", "college", "email", "department_section", "password_hash"],
+    },
+}
+
+# Every spelling of a role used across the app: registration form status,
+# session user_type and change feed table names
+ROLE_ALIASES = {
+    'student': 'student',
+    'students': 'student',
+    'alumni': 'alumni',
+    'college': 'college',
+    'admin': 'college',
+    'admins': 'college',
+}
+
+# Change feed table names handed to clients -> role
+FEED_TABLES = {
+    'students': 'student',
+    'alumni': 'alumni',
+}
+
+def resolve_role(status):
+    return ROLE_ALIASES.get(status)
+
+
+# ---------- SQL statement registry ----------
+def _build_statements(table, columns, insert_columns):
+    cols = ", ".join(columns)
+    feed = f"SELECT {cols} FROM {table} {{where}} ORDER BY registration_date, id LIMIT %s"
+    after_cursor = "(registration_date > %s OR (registration_date = %s AND id > %s))"
+    # Everything from a start date up to and including a cursor; the complement of after_cursor
+    window = "registration_date >= %s AND (registration_date < %s OR (registration_date = %s AND id <= %s))"
+    statements = {
+        'email_exists': f"SELECT 1 FROM {table} WHERE email=%s LIMIT 1",
+        'id_exists': f"SELECT 1 FROM {table} WHERE id=%s LIMIT 1",
+        'login': f"SELECT {cols}, password_hash FROM {table} WHERE email=%s",
+        'by_email': f"SELECT {cols} FROM {table} WHERE email=%s",
+        'by_id': f"SELECT {cols} FROM {table} WHERE id=%s",
+        'list': f"SELECT {cols} FROM {table}",
+        'list_college': f"SELECT {cols} FROM {table} WHERE college=%s",
+        'insert': f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                  f"VALUES ({', '.join(['%s'] * len(insert_columns))})",
+        'feed': feed.format(where=""),
+        'feed_college': feed.format(where="WHERE college=%s"),
+        'feed_since': feed.format(where=f"WHERE {after_cursor}"),
+        'feed_since_college': feed.format(where=f"WHERE college=%s AND {after_cursor}"),
+        'feed_window': feed.format(where=f"WHERE {window}"),
+        'feed_window_college': feed.format(where=f"WHERE college=%s AND {window}"),
+        'latest': f"SELECT registration_date, id FROM {table} ORDER BY registration_date DESC, id DESC LIMIT 1",
+    }
+    if "graduation_year" in columns:
+        statements['list_college_by_grad_year'] = \
+            f"SELECT {cols} FROM {table} WHERE college=%s ORDER BY graduation_year DESC"
+    return statements
+
+# Built once at import: (role, operation) -> SQL
+STATEMENTS = {
+    (role, operation): sql
+    for role, meta in ROLES.items()
+    for operation, sql in _build_statements(meta['table'], meta['columns'], meta['insert']).items()
+}
+STATEMENTS[('account_keys', 'claim')] = \
+    "INSERT INTO AccountKeys (table_name, key_type, key_value) VALUES (%s, %s, %s)"
+STATEMENTS[('feedback', 'insert')] = """
+    INSERT INTO Feedback (user_id, user_type, college, rating, message, submitted_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+def _statement(status, operation):
+    role = resolve_role(status)
+    if role is None:
+        raise ValueError(f"Unknown role: {status}")
+    return STATEMENTS[(role, operation)]
+
+
+# ---------- Generic role queries ----------
+@idempotent_read
+def email_exists(status, email):
+    return _execute(_statement(status, 'email_exists'), (email,), fetch="one") is not None
+
+@idempotent_read
+def id_exists(status, row_id):
+    return _execute(_statement(status, 'id_exists'), (row_id,), fetch="one") is not None
+
+@idempotent_read
+def get_user_by_email(status, email, with_password=False):
+    """Fetch one account by email; password_hash is included only when asked for."""
+    operation = 'login' if with_password else 'by_email'
+    return _execute(_statement(status, operation), (email,), fetch="one")
+
+@idempotent_read
+def get_user_by_id(status, row_id):
+    return _execute(_statement(status, 'by_id'), (row_id,), fetch="one")
+
+@idempotent_read
+def list_users(status, college=None):
+    if college is None:
+        return _execute(_statement(status, 'list'), fetch="all")
+    return _execute(_statement(status, 'list_college'), (college,), fetch="all")
+
+@idempotent_read
+def get_alumni_by_graduation_year(college):
+    return _execute(_statement('alumni', 'list_college_by_grad_year'), (college,), fetch="all")
+
+def insert_user(status, values):
+    """
+    values: tuple in the order of the role's 'insert' columns. The account's
+    id and email are claimed in AccountKeys in the same transaction, so a
+    concurrent duplicate fails with IntegrityError even on partitioned tables.
+    """
+    insert = _statement(status, 'insert')
+    meta = ROLES[resolve_role(status)]
+    statements = []
+    for key_type in ('id', 'email'):
+        key_value = values[meta['insert'].index(key_type)]
+        if key_value is not None:
+            statements.append((STATEMENTS[('account_keys', 'claim')], (meta['table'], key_type, key_value)))
+    statements.append((insert, values))
+    return _execute_transaction(statements)[-1]
+
+
+# ---------- Student ----------
+def insert_student(name, college, email, sid,  department, graduation_year, degree, password_hash):
+    insert_user('student', (sid, name, college, email, department, graduation_year, degree, password_hash))
+    return sid
+
+# ---------- Alumni ----------
+def insert_alumni(name, college, email, department, graduation_year, degree, profile_image, password_hash):
+    alumni_id = str(uuid.uuid4())
+    insert_user('alumni', (alumni_id, name, college, email, department, graduation_year, degree, profile_image,
+                           password_hash))
+    return alumni_id
+
+# ---------- Admin ----------
+def insert_admin(name, college, email, admin_code, department_section, password_hash):
+    insert_user('college', (admin_code, name, college, email, department_section, password_hash))
+    return admin_code
+
+# ---------- Feedback ----------
+def insert_feedback_batch(rows):
+    """rows: list of (user_id, user_type, college, rating, message, submitted_at) tuples"""
+    _execute(STATEMENTS[('feedback', 'insert')], rows, many=True)
+    return len(rows)
 
 
 # ---------- Check uniqueness ----------
 def is_unique_student_id(student_id):
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) AS count FROM Students WHERE id=%s", (student_id,))
-    count = cursor.fetchone()['count']
-    conn.close()
-    return count == 0
+    return not id_exists('student', student_id)
 
 def is_unique_admin_code(admin_code):
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) AS count FROM Admins WHERE id=%s", (admin_code,))
-    count = cursor.fetchone()['count']
-    conn.close()
-    return count == 0
+    return not id_exists('college', admin_code)
 
 def is_unique_email(email, status):
     """
     status: 'student', 'alumni', 'college'
     """
-    table_map = {
-        'student': 'Students',
-        'alumni': 'Alumni',
-        'college': 'Admins'
-    }
-    table = table_map.get(status)
-    if not table:
+    if not resolve_role(status):
         return False
-
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT COUNT(*) AS count FROM {table} WHERE email=%s", (email,))
-    count = cursor.fetchone()['count']
-    conn.close()
-    return count == 0
+    return not email_exists(status, email)
 
 
 # ---------- Show all Students ----------
-def get_all_students():
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Students")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+def get_all_students(college=None):
+    return list_users('student', college)
 
 # ---------- Show all Alumni ----------
-def get_all_alumni():
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Alumni")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+def get_all_alumni(college=None):
+    return list_users('alumni', college)
 
 # ---------- Show all Admins ----------
-def get_all_admins():
-    conn = get_connection("AlumniNexus")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Admins")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-
-def login_credential_exists(email, status):
-
-    if status == 'student':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM Students WHERE email=%s", (email,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
-    
-    elif status == 'alumni':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM Alumni WHERE email=%s", (email,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
-    
-    elif status == 'college':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM Admins WHERE email=%s", (email,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
-
-def verify_student_credentials(email, password, status):
-
-    if status == 'student':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT password_hash FROM Students WHERE email=%s", (email,))
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return verify_password(password, result['password_hash'])
-        return False
-    elif status == 'alumni':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT password_hash FROM Alumni WHERE email=%s", (email,))
-        result = cursor.fetchone()
-        conn.close()
+def get_all_admins(college=None):
+    return list_users('college', college)
 
-        if result:
-            return verify_password(password, result['password_hash'])
-        return False
-    elif status == 'college':
-        conn = get_connection("AlumniNexus")
-        cursor = conn.cursor()
-        cursor.execute("SELECT password_hash FROM Admins WHERE email=%s", (email,))
-        result = cursor.fetchone()
-        conn.close()
 
-        if result:
-            return verify_password(password, result['password_hash'])
-        return False
+# ---------- Change feed (rows registered after a cursor) ----------
+@idempotent_read
+def get_changes_since(kind, since_date=None, since_id="", limit=500, college=None):
+    """
+    Return rows of `kind` ('students' or 'alumni') registered after the
+    (registration_date, id) cursor, oldest first. With no cursor the
+    feed starts from the beginning of the table. Passing `college`
+    restricts the feed to that tenant.
+    """
+    role = FEED_TABLES.get(kind)
+    if not role:
+        return []
+
+    operation = 'feed'
+    params = []
+    if since_date is not None:
+        operation = 'feed_since'
+        params = [since_date, since_date, since_id]
+    if college is not None:
+        operation = 'feed_since_college' if since_date is not None else 'feed_college'
+        params = [college] + params
+    return _execute(STATEMENTS[(role, operation)], (*params, limit), fetch="all")
+
+@idempotent_read
+def get_changes_in_window(kind, window_start, end_date, end_id, limit=500, college=None):
+    """
+    Return rows of `kind` registered from window_start up to and including the
+    (end_date, end_id) cursor. Used to re-read the overlap behind a feed
+    cursor without repeating the rows get_changes_since returns after it.
+    """
+    role = FEED_TABLES.get(kind)
+    if not role:
+        return []
+
+    params = (window_start, end_date, end_date, end_id, limit)
+    if college is None:
+        return _execute(STATEMENTS[(role, 'feed_window')], params, fetch="all")
+    return _execute(STATEMENTS[(role, 'feed_window_college')], (college, *params), fetch="all")
+
+@idempotent_read
+def get_latest_cursor(kind):
+    """Return the (registration_date, id) of the newest row, or (None, "") for an empty table."""
+    role = FEED_TABLES.get(kind)
+    if not role:
+        return None, ""
+
+    row = _execute(STATEMENTS[(role, 'latest')], fetch="one")
+    if not row:
+        return None, ""
+    return row['registration_date'], row['id']
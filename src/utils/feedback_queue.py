@@ -0,0 +1,115 @@
+import atexit
+import queue
+import threading
+import time
+
+from src.utils.database import insert_feedback_batch
+
+
+MAX_MESSAGE_LENGTH = 2000
+
+
+def validate_feedback(rating, message):
+    """Validate a feedback submission, returning a list of error messages"""
+    errors = []
+
+    # Only whole numbers: JSON true or 4.9 would otherwise pass through int() as 1 or 4
+    if isinstance(rating, str) and rating.strip().isascii() and rating.strip().isdigit():
+        rating = int(rating)
+    elif isinstance(rating, bool) or not isinstance(rating, int):
+        rating = None
+    if rating is None or not 1 <= rating <= 5:
+        errors.append("Rating must be a number from 1 to 5")
+
+    if message is not None and not isinstance(message, str):
+        # JSON bodies can carry numbers, lists etc. where the form would send text
+        errors.append("Feedback message must be text")
+        return errors
+
+    message = (message or "").strip()
+    if not message:
+        errors.append("Feedback message is required")
+    elif len(message) > MAX_MESSAGE_LENGTH:
+        errors.append(f"Feedback message must be at most {MAX_MESSAGE_LENGTH} characters")
+
+    return errors
+
+
+class FeedbackBuffer:
+    """
+    Bounded in-process buffer for feedback submissions. Requests only enqueue;
+    a background thread writes batches with one executemany insert whenever
+    `batch_size` rows are waiting or `flush_interval` seconds have passed.
+    When the buffer is full, submit() returns False so the caller can shed load.
+    """
+
+    def __init__(self, max_size=10000, batch_size=500, flush_interval=1.0, writer=insert_feedback_batch):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+
+    def submit(self, row):
+        """Enqueue one row tuple for insert_feedback_batch. Returns False if the buffer is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self, timeout=10):
+        """Write out everything still buffered and stop the background writer."""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _take_batch(self, batch):
+        # Collect rows until the batch is full or the flush interval runs out
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self._stop.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                continue
+
+    def _run(self):
+        batch = []
+        failures = 0
+        while True:
+            self._take_batch(batch)
+            if batch:
+                try:
+                    self.written += self.writer(batch)
+                    batch = []
+                    failures = 0
+                except Exception as e:
+                    # Keep the batch and retry; the queue filling up pushes back on new submissions
+                    failures += 1
+                    print(f"❌ Error writing {len(batch)} feedback rows:", e)
+                    if self._stop.is_set() and failures >= 3:
+                        print(f"❌ Dropping {len(batch) + self._queue.qsize()} feedback rows on shutdown")
+                        return
+                    # Back off, but wake straight away when close() is called
+                    self._stop.wait(min(30, 2 ** failures))
+            elif self._stop.is_set():
+                return
@@ -4,6 +4,8 @@ from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import current_app as app
 
+from src.utils.profiling import span
+
 
 # Configuration for file uploads
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf'}
@@ -24,12 +26,14 @@ def save_uploaded_file(file, user_name, user_status):
         filename = f"{user_status}_{clean_name}_{timestamp}_{unique_id}.{file_extension}"
 
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        with span("file_io"):
+            file.save(filepath)
+            file_size = os.path.getsize(filepath)
 
         return {
             'original_name': file.filename,
             'saved_name': filename,
             'filepath': os.path.abspath(filepath),
-            'file_size': os.path.getsize(filepath)
+            'file_size': file_size
         }
     return None
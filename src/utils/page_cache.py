@@ -0,0 +1,77 @@
+import hashlib
+import os
+import threading
+
+from flask import current_app, make_response, render_template, render_template_string, request
+
+
+PAGE_CACHE_MAX_AGE = int(os.getenv("PAGE_CACHE_MAX_AGE", "300"))
+
+
+class CachedPage:
+    def __init__(self, body, uptodate):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.uptodate = uptodate
+
+
+class PageCache:
+    """
+    Holds pre-rendered bytes for templates that don't depend on the request,
+    re-rendering a page only when Jinja reports its template file changed.
+    """
+
+    def __init__(self):
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def get(self, template_name):
+        page = self._pages.get(template_name)
+        if page is None or not page.uptodate():
+            page = self._render(template_name)
+            with self._lock:
+                self._pages[template_name] = page
+        return page
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def _render(self, template_name):
+        env = current_app.jinja_env
+        source, _, uptodate = env.loader.get_source(env, template_name)
+        # Render the source we just read rather than render_template(): Jinja only
+        # recompiles its cached copy of a changed file when auto_reload (debug) is on
+        body = render_template_string(source).encode("utf-8")
+        return CachedPage(body, uptodate or (lambda: True))
+
+
+page_cache = PageCache()
+
+
+def cached_page(template_name, max_age=PAGE_CACHE_MAX_AGE):
+    """Serve a cached template with an ETag, answering 304 when the browser already has it."""
+    page = page_cache.get(template_name)
+    response = make_response(page.body)
+    response.set_etag(page.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+def prerender_pages(app, pages, out_dir):
+    """
+    Render each {url path: template} pair to <out_dir>/<path>/index.html so a
+    front proxy can serve them without calling into Flask.
+    """
+    written = []
+    for path, template_name in pages.items():
+        with app.test_request_context(path):
+            body = render_template(template_name)
+        target_dir = os.path.join(out_dir, path.strip("/"))
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, "index.html")
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(body)
+        written.append(target)
+    return written
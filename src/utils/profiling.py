@@ -0,0 +1,178 @@
+import cProfile
+import glob
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import before_render_template, template_rendered
+
+
+SPAN_KINDS = ("db", "hashing", "template", "file_io")
+
+_state = threading.local()
+
+
+class RequestTrace:
+    """Timings for one profiled request, broken down by span kind."""
+
+    def __init__(self, method, path, endpoint, use_cprofile=True):
+        self.id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:6]}"
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.started_at = datetime.now()
+        self.spans = {kind: 0.0 for kind in SPAN_KINDS}
+        self.counts = {kind: 0 for kind in SPAN_KINDS}
+        self.status = None
+        self.duration = None
+        self._template_starts = []
+        self._start = time.perf_counter()
+
+        self.profiler = None
+        if use_cprofile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:
+                # Another profiler is already active in this process; keep the span timings only
+                pass
+
+    def add(self, kind, seconds):
+        self.spans[kind] += seconds
+        self.counts[kind] += 1
+
+    def finish(self, status):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.duration = time.perf_counter() - self._start
+        self.status = status
+
+    def summary(self, top=15):
+        spans_ms = {kind: round(seconds * 1000, 2) for kind, seconds in self.spans.items()}
+        spans_ms["other"] = round(max(0.0, self.duration * 1000 - sum(spans_ms.values())), 2)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_ms": round(self.duration * 1000, 2),
+            "spans_ms": spans_ms,
+            "span_counts": self.counts,
+            "top_functions": self._top_functions(top),
+            "has_profile": self.profiler is not None,
+        }
+
+    def _top_functions(self, top):
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, _, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "cumulative_ms": round(cumulative * 1000, 2),
+            })
+        rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+        return rows[:top]
+
+
+def current_trace():
+    return getattr(_state, "trace", None)
+
+def start_trace(method, path, endpoint, use_cprofile=True):
+    _state.trace = RequestTrace(method, path, endpoint, use_cprofile)
+    return _state.trace
+
+def end_trace():
+    trace = current_trace()
+    _state.trace = None
+    if trace is not None and trace.profiler is not None and trace.duration is None:
+        trace.profiler.disable()
+    return trace
+
+@contextmanager
+def span(kind):
+    """Time the enclosed block under `kind` if the current request is being profiled."""
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(kind, time.perf_counter() - start)
+
+
+# ---------- Template render spans via Flask signals ----------
+def _template_started(sender, template, context, **extra):
+    trace = current_trace()
+    if trace is not None:
+        trace._template_starts.append(time.perf_counter())
+
+def _template_finished(sender, template, context, **extra):
+    trace = current_trace()
+    if trace is not None and trace._template_starts:
+        trace.add("template", time.perf_counter() - trace._template_starts.pop())
+
+def connect_template_signals(app):
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+
+class TraceStore:
+    """
+    Saves trace summaries (JSON) and raw cProfile dumps (.prof, readable with
+    pstats or snakeviz) to a directory, keeping only the newest `max_traces`.
+    """
+
+    def __init__(self, directory, max_traces=200):
+        self.directory = directory
+        self.max_traces = max_traces
+        self._lock = threading.Lock()
+
+    def save(self, trace):
+        os.makedirs(self.directory, exist_ok=True)
+        summary = trace.summary()
+        with open(os.path.join(self.directory, f"{trace.id}.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f)
+        if trace.profiler is not None:
+            trace.profiler.dump_stats(os.path.join(self.directory, f"{trace.id}.prof"))
+        self._prune()
+        return summary
+
+    def _prune(self):
+        with self._lock:
+            summaries = sorted(glob.glob(os.path.join(self.directory, "*.json")))
+            for path in summaries[:max(0, len(summaries) - self.max_traces)]:
+                for stale in (path, path[:-len(".json")] + ".prof"):
+                    try:
+                        os.remove(stale)
+                    except FileNotFoundError:
+                        pass
+
+    def slowest(self, limit=50):
+        summaries = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    summaries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        summaries.sort(key=lambda summary: summary["duration_ms"], reverse=True)
+        return summaries[:limit]
+
+    def profile_path(self, trace_id):
+        """Path of a saved .prof dump, or None if the id is unknown."""
+        path = os.path.join(self.directory, f"{os.path.basename(trace_id)}.prof")
+        return path if os.path.exists(path) else None
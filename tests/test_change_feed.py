@@ -0,0 +1,136 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.utils import change_feed, database
+from src.utils.change_feed import RegistrationBroadcaster, decode_cursor, encode_cursor, fetch_changes
+
+D = datetime(2026, 3, 1, 12, 0, 0)
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+
+@pytest.fixture
+def students(monkeypatch):
+    """An in-memory Students table that runs the repository's real feed SQL."""
+    conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE Students (
+            id TEXT, name TEXT, college TEXT, email TEXT, department TEXT,
+            graduation_year INT, degree TEXT, registration_date TIMESTAMP
+        )
+    """)
+
+    def execute(sql, params=(), fetch=None, many=False):
+        cursor = conn.execute(sql.replace("%s", "?"), params)
+        if fetch == "one":
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        return [dict(row) for row in cursor.fetchall()]
+
+    def add(row_id, registration_date, college="IIT Delhi"):
+        conn.execute("INSERT INTO Students (id, college, registration_date) VALUES (?, ?, ?)",
+                     (row_id, college, registration_date))
+
+    monkeypatch.setattr(database, "_execute", execute)
+    return add
+
+
+def ids(rows):
+    return [row['id'] for row in rows]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(D, "abc|def")) == (D, "abc|def")
+
+
+def test_empty_cursor():
+    assert encode_cursor(None, "") == ""
+    assert decode_cursor("") == (None, "")
+
+
+def test_malformed_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("yesterday|abc")
+
+
+def test_overlap_window_does_not_repeat_rows_after_the_cursor(students):
+    students("a", D)
+    students("b", D - timedelta(seconds=2))
+    students("c", D)
+
+    rows, cursor, has_more = fetch_changes("students", D, "a")
+
+    assert sorted(ids(rows)) == ["a", "b", "c"]
+    assert cursor == (D, "c")
+    assert not has_more
+
+
+def test_same_second_row_with_smaller_id_is_returned(students):
+    students("m", D)
+    _, cursor, _ = fetch_changes("students")
+    assert cursor == (D, "m")
+
+    students("k", D)
+    rows, cursor, _ = fetch_changes("students", *cursor)
+
+    assert "k" in ids(rows)
+    assert cursor == (D, "m")
+
+
+def test_paging_advances_past_a_full_page(students):
+    for row_id in "abcde":
+        students(row_id, D)
+
+    rows, cursor, has_more = fetch_changes("students", limit=2)
+    assert ids(rows) == ["a", "b"] and has_more
+
+    rows, cursor, has_more = fetch_changes("students", *cursor, limit=2)
+    assert cursor == (D, "d") and has_more
+    assert ids(rows)[-2:] == ["c", "d"]
+
+
+def test_college_scope(students):
+    students("a", D, college="IIT Delhi")
+    students("b", D, college="NIT Trichy")
+
+    rows, _, _ = fetch_changes("students", college="NIT Trichy")
+
+    assert ids(rows) == ["b"]
+
+
+def test_unknown_kind_is_empty(students):
+    assert fetch_changes("admins") == ([], (None, ""), False)
+
+
+def test_broadcaster_publishes_a_late_row_once(students, monkeypatch):
+    monkeypatch.setattr(change_feed, "FEED_TABLES", {"students": "student"})
+    students("m", D)
+    broadcaster = RegistrationBroadcaster()
+    published = []
+    broadcaster._publish = lambda kind, rows, cursor: published.append(ids(rows))
+    broadcaster._prime()
+
+    students("k", D)
+    students("z", D)
+    broadcaster._poll_once()
+    broadcaster._poll_once()
+
+    assert published == [["k", "z"]]
+
+
+def test_stream_matches_colleges_like_mysql_collation(monkeypatch):
+    broadcaster = RegistrationBroadcaster(serializer=lambda payload: ",".join(ids(payload["rows"])))
+    monkeypatch.setattr(broadcaster, "_run", lambda: None)
+    q = broadcaster.subscribe("IIT Delhi")
+
+    broadcaster._publish("students", [
+        {"id": "a", "college": "iit delhi"},
+        {"id": "b", "college": "IÍT DELHI"},
+        {"id": "c", "college": "IIT Bombay"},
+    ], "")
+
+    assert q.get_nowait() == "event: registrations\ndata: a,b\n\n"
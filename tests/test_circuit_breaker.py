@@ -0,0 +1,140 @@
+import pymysql
+import pytest
+
+from src.utils import database
+from src.utils.database import CircuitBreaker, DatabaseUnavailable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(database, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    monkeypatch.setattr(database, "db_breaker", breaker)
+    return breaker
+
+
+class BrokenConnection:
+    """A pooled connection whose every statement fails like a dropped socket."""
+    open = True
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        raise pymysql.err.OperationalError(2013, "Lost connection to MySQL server during query")
+
+    executemany = execute
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def broken_db(monkeypatch):
+    monkeypatch.setattr(database.db_pool, "acquire", BrokenConnection)
+    monkeypatch.setattr(database, "DB_READ_RETRIES", 2)
+
+
+def test_opens_after_threshold_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+
+def test_half_open_lets_one_trial_through(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+
+    assert not breaker.is_open
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.is_open
+
+
+def test_unreported_trial_expires(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_retried_read_counts_as_one_failure(breaker, broken_db):
+    with pytest.raises(DatabaseUnavailable):
+        database.show_tables()
+    assert breaker.failures == 1
+
+    with pytest.raises(DatabaseUnavailable):
+        database.show_tables()
+    assert not breaker.is_open
+
+
+def test_each_failed_write_counts(breaker, broken_db):
+    for _ in range(3):
+        with pytest.raises(pymysql.err.OperationalError):
+            database.insert_feedback_batch([("id", "student", "IIT Delhi", 5, "Great", None)])
+    assert breaker.is_open
+
+
+def test_raw_connections_do_not_take_the_trial_slot(breaker, clock, monkeypatch):
+    monkeypatch.setattr(database, "_connect", lambda *args: object())
+    for _ in range(3):
+        breaker.record_failure()
+    with pytest.raises(DatabaseUnavailable):
+        database.get_connection()
+
+    clock.now += 30
+    database.get_connection()
+    assert breaker.allow()
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from src.utils.feedback_queue import MAX_MESSAGE_LENGTH, FeedbackBuffer, validate_feedback
+
+
+@pytest.mark.parametrize("rating", [1, 5, "3", " 4 "])
+def test_accepts_whole_ratings(rating):
+    assert validate_feedback(rating, "Great event") == []
+
+
+@pytest.mark.parametrize("rating", [0, 6, True, 4.9, 4.0, "4.5", "²", "", None, [5]])
+def test_rejects_other_ratings(rating):
+    assert validate_feedback(rating, "Great event") == ["Rating must be a number from 1 to 5"]
+
+
+@pytest.mark.parametrize("message", [123, ["hi"], {"text": "hi"}])
+def test_rejects_non_text_messages(message):
+    assert validate_feedback(5, message) == ["Feedback message must be text"]
+
+
+def test_message_is_required_and_bounded():
+    assert validate_feedback(5, "   ") == ["Feedback message is required"]
+    assert validate_feedback(5, None) == ["Feedback message is required"]
+    assert validate_feedback(5, "x" * (MAX_MESSAGE_LENGTH + 1)) == [
+        f"Feedback message must be at most {MAX_MESSAGE_LENGTH} characters"]
+
+
+class RecordingWriter:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def __call__(self, rows):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("database down")
+        self.batches.append(list(rows))
+        return len(rows)
+
+
+def test_close_writes_everything_in_batches():
+    writer = RecordingWriter()
+    buffer = FeedbackBuffer(batch_size=3, flush_interval=5, writer=writer)
+    for i in range(7):
+        assert buffer.submit((i,))
+
+    buffer.close()
+
+    assert [row for batch in writer.batches for row in batch] == [(i,) for i in range(7)]
+    assert all(len(batch) <= 3 for batch in writer.batches)
+    assert buffer.written == 7
+
+
+def test_full_buffer_pushes_back():
+    release = threading.Event()
+    buffer = FeedbackBuffer(max_size=2, batch_size=1, flush_interval=0.01,
+                            writer=lambda rows: release.wait() and len(rows))
+    results = [buffer.submit((i,)) for i in range(5)]
+    release.set()
+    buffer.close()
+
+    assert results[-1] is False
+
+
+def test_failed_batch_is_retried():
+    writer = RecordingWriter(fail_times=1)
+    buffer = FeedbackBuffer(flush_interval=0.01, writer=writer)
+    buffer.submit(("kept",))
+
+    buffer.close()
+
+    assert writer.batches == [[("kept",)]]